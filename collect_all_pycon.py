@@ -1,44 +1,113 @@
 #!/usr/bin/env python3
 
 import asyncio
+import re
+import sys
+from datetime import date
 import duckdb
 from pathlib import Path
 from mcp_server.youtube_server import (
-    get_video_urls_from_playlist,
+    iter_video_urls_from_playlist,
     save_video_urls,
-    init_database
+    init_database,
+    install_pytube_session
 )
 from loguru import logger
 
 # Database path
 DB_PATH = Path("youtube_videos.db")
+# 호출마다 새로 연결하므로 경로 문자열은 한 번만 만들어 둠
+DB_PATH_STR = str(DB_PATH)
 
-def get_all_collected_videos():
-    """데이터베이스에서 모든 수집된 영상 조회"""
-    conn = duckdb.connect(str(DB_PATH))
-    try:
-        result = conn.execute("""
-            SELECT url, title, channel_name, source_type, source_url, collected_at
+# 동시에 수집할 최대 플레이리스트 수
+FETCH_CONCURRENCY = 4
+
+# PyCon KR 연도 패턴 (2014 ~ 2024)
+YEAR_PATTERN = r"(201[4-9]|202[0-4])"
+YEAR_RE = re.compile(YEAR_PATTERN)
+
+# 올해 플레이리스트를 다시 수집하기까지의 기간 (지난 연도는 다시 수집하지 않음)
+PLAYLIST_CACHE_TTL_DAYS = 7
+
+def get_collection_stats():
+    """수집된 영상의 그룹별 통계를 DuckDB에서 집계하여 조회"""
+    # 통계 조회 동안만 연결을 유지 (다른 MCP 서버가 DB 파일을 쓸 수 있도록 바로 닫음)
+    with duckdb.connect(DB_PATH_STR) as conn:
+        total_count = conn.execute("SELECT COUNT(*) FROM video_urls").fetchone()[0]
+        
+        # 소스 URL과 제목에서 추출한 연도별 영상 수
+        year_stats = conn.execute("""
+            SELECT
+                regexp_extract(coalesce(source_url, '') || ' ' || coalesce(title, ''), ?, 1) AS year,
+                COUNT(*) AS count
             FROM video_urls
-            ORDER BY collected_at DESC
+            GROUP BY year
+            HAVING year <> ''
+            ORDER BY year DESC
+        """, (YEAR_PATTERN,)).fetchall()
+        
+        source_stats = conn.execute("""
+            SELECT source_type, COUNT(*) AS count
+            FROM video_urls
+            GROUP BY source_type
         """).fetchall()
         
-        videos = []
-        for row in result:
-            videos.append({
-                'url': row[0],
-                'title': row[1],
-                'channel_name': row[2],
-                'source_type': row[3],
-                'source_url': row[4],
-                'collected_at': row[5]
-            })
-        return videos
-    finally:
-        conn.close()
+        # 상위 5개 채널
+        channel_stats = conn.execute("""
+            SELECT channel_name, COUNT(*) AS count
+            FROM video_urls
+            GROUP BY channel_name
+            ORDER BY count DESC
+            LIMIT 5
+        """).fetchall()
+    
+    return total_count, year_stats, source_stats, channel_stats
+
+def init_playlist_meta():
+    """플레이리스트별 마지막 수집 시간 테이블 초기화"""
+    with duckdb.connect(DB_PATH_STR) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS playlist_meta (
+                source_url TEXT PRIMARY KEY,
+                last_fetched_at TIMESTAMP
+            )
+        """)
 
-async def collect_all_pycon_playlists():
-    """모든 PyCon KR 플레이리스트에서 영상 수집"""
+def is_playlist_fresh(year, playlist_url):
+    """최근에 수집한 플레이리스트인지 확인
+
+    지난 연도의 플레이리스트는 한 번 수집하면 바뀌지 않으므로 계속 캐시된 것으로 보고,
+    올해(또는 연도를 알 수 없는) 플레이리스트는 PLAYLIST_CACHE_TTL_DAYS 동안만 캐시합니다.
+    """
+    with duckdb.connect(DB_PATH_STR) as conn:
+        row = conn.execute("""
+            SELECT last_fetched_at >= CURRENT_TIMESTAMP - to_days(?)
+            FROM playlist_meta
+            WHERE source_url = ?
+        """, (PLAYLIST_CACHE_TTL_DAYS, playlist_url)).fetchone()
+    if row is None:
+        return False
+    
+    match = YEAR_RE.search(year)
+    if match and int(match.group(1)) < date.today().year:
+        return True
+    return bool(row[0])
+
+def mark_playlists_fetched(playlist_urls):
+    """플레이리스트의 마지막 수집 시간 갱신"""
+    if not playlist_urls:
+        return
+    with duckdb.connect(DB_PATH_STR) as conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO playlist_meta (source_url, last_fetched_at)
+            VALUES (?, CURRENT_TIMESTAMP)
+        """, [(playlist_url,) for playlist_url in playlist_urls])
+
+async def collect_all_pycon_playlists(force=False):
+    """모든 PyCon KR 플레이리스트에서 영상 수집
+
+    force가 False이면 최근에 수집한 플레이리스트는 건너뜁니다.
+    """
     
     # PyCon KR 플레이리스트 목록
     playlists = {
@@ -58,162 +127,85 @@ async def collect_all_pycon_playlists():
     
     # 데이터베이스 초기화
     init_database()
+    init_playlist_meta()
+    
+    # 최근에 수집한 플레이리스트는 건너뛰기
+    if not force:
+        cached = [year for year, playlist_url in playlists.items() if is_playlist_fresh(year, playlist_url)]
+        for year in cached:
+            logger.info("⏭️ {}: 최근에 수집되어 건너뜁니다", year)
+            del playlists[year]
+    
+    # 모든 플레이리스트의 영상을 플레이리스트별 목록 없이 바로 모음
+    all_videos = []
+    
+    def drain_playlist(playlist_url):
+        """플레이리스트 영상을 all_videos에 추가하고 (영상 수, 미리보기 제목) 반환"""
+        video_count = 0
+        preview_titles = []
+        for video in iter_video_urls_from_playlist(playlist_url):
+            all_videos.append(video)
+            video_count += 1
+            if len(preview_titles) < 3:
+                preview_titles.append(video[1])  # (url, title, ...)
+        return video_count, preview_titles
+    
+    # 플레이리스트 동시 수집 (YouTube 요청 제한을 피하기 위해 동시 실행 수 제한)
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+    
+    async def fetch_one(year, playlist_url):
+        async with semaphore:
+            logger.info("📋 {} 플레이리스트 처리 중...", year)
+            logger.info("   URL: {}", playlist_url)
+            return await asyncio.to_thread(drain_playlist, playlist_url)
+    
+    results = await asyncio.gather(
+        *(fetch_one(year, playlist_url) for year, playlist_url in playlists.items()),
+        return_exceptions=True
+    )
     
     total_collected = 0
     success_count = 0
     error_count = 0
+    fetched_urls = []
     
-    for year, playlist_url in playlists.items():
+    for (year, playlist_url), result in zip(playlists.items(), results):
         try:
-            logger.info(f"📋 {year} 플레이리스트 처리 중...")
-            logger.info(f"   URL: {playlist_url}")
+            if isinstance(result, Exception):
+                raise result
             
-            # 영상 수집
-            collected_videos = get_video_urls_from_playlist(playlist_url)
-            
-            if collected_videos:
-                # 데이터베이스에 저장
-                save_video_urls(collected_videos)
-                video_count = len(collected_videos)
+            video_count, preview_titles = result
+            if video_count:
+                fetched_urls.append(playlist_url)
                 total_collected += video_count
                 success_count += 1
                 
-                logger.info(f"✅ {year}: {video_count}개 영상 수집 완료")
+                logger.info("✅ {}: {}개 영상 수집 완료", year, video_count)
                 
-                # 처음 3개 영상 제목 미리보기
-                logger.info(f"   미리보기:")
-                for i, video in enumerate(collected_videos[:3], 1):
-                    logger.info(f"     {i}. {video['title'][:60]}...")
-                if len(collected_videos) > 3:
-                    logger.info(f"     ... 및 {len(collected_videos) - 3}개 더")
+                # 처음 3개 영상 제목 미리보기 (로그 레벨이 INFO보다 높으면 포맷팅하지 않음)
+                logger.info("   미리보기:")
+                for i, title in enumerate(preview_titles, 1):
+                    logger.info("     {}. {:.60}...", i, title)
+                if video_count > 3:
+                    logger.info("     ... 및 {}개 더", video_count - 3)
             else:
-                logger.warning(f"⚠️ {year}: 수집된 영상이 없습니다")
+                logger.warning("⚠️ {}: 수집된 영상이 없습니다", year)
                 
         except Exception as e:
             error_count += 1
-            logger.error(f"❌ {year} 처리 실패: {str(e)}")
+            logger.error("❌ {} 처리 실패: {}", year, e)
             continue
     
-    # 최종 요약
-    logger.info(f"🎉 전체 수집 완료!")
-    logger.info(f"   ✅ 성공한 플레이리스트: {success_count}개")
-    logger.info(f"   ❌ 실패한 플레이리스트: {error_count}개")
-    logger.info(f"   📊 총 수집된 영상: {total_collected}개")
-    
-    # 데이터베이스 전체 통계
-    show_final_database_stats()
-
-def show_final_database_stats():
-    """최종 데이터베이스 통계 표시"""
-    try:
-        all_videos = get_all_collected_videos()
-        
-        logger.info(f"📈 데이터베이스 최종 통계:")
-        logger.info(f"   📺 총 저장된 영상: {len(all_videos)}개")
-        
-        # 연도별 통계
-        year_stats = {}
-        source_stats = {}
-        channel_stats = {}
-        
-        for video in all_videos:
-            # 소스 URL에서 연도 추출 시도
-            source_url = video.get('source_url', '')
-            title = video.get('title', '')
-            
-            # 제목이나 URL에서 연도 찾기
-            for year in ['2024', '2023', '2022', '2021', '2020', '2019', '2018', '2017', '2016', '2015', '2014']:
-                if year in source_url or year in title:
-                    year_key = f"PyCon KR {year}"
-                    year_stats[year_key] = year_stats.get(year_key, 0) + 1
-                    break
-            
-            # 소스 타입별 통계
-            source_type = video.get('source_type', 'unknown')
-            source_stats[source_type] = source_stats.get(source_type, 0) + 1
-            
-            # 채널별 통계
-            channel = video.get('channel_name', 'Unknown')
-            channel_stats[channel] = channel_stats.get(channel, 0) + 1
-        
-        if year_stats:
-            logger.info(f"   🎯 연도별 분포:")
-            for year, count in sorted(year_stats.items(), key=lambda x: x[0], reverse=True):
-                logger.info(f"     - {year}: {count}개")
-        
-        if source_stats:
-            logger.info(f"   📋 소스 타입별:")
-            for source_type, count in source_stats.items():
-                logger.info(f"     - {source_type}: {count}개")
-        
-        if channel_stats:
-            logger.info(f"   📺 주요 채널:")
-            sorted_channels = sorted(channel_stats.items(), key=lambda x: x[1], reverse=True)
-            for channel, count in sorted_channels[:5]:  # 상위 5개 채널만 표시
-                logger.info(f"     - {channel}: {count}개")
-        
-    except Exception as e:
-        logger.error(f"통계 생성 오류: {e}")
-
-if __name__ == "__main__":
-    asyncio.run(collect_all_pycon_playlists())
-    """모든 PyCon KR 플레이리스트에서 영상 수집"""
-    
-    # PyCon KR 플레이리스트 목록
-    playlists = {
-        "PyCon.KR 2024": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRldfheI6KcgektEiXAIPJaY",
-        "PyCon.KR 2023": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRllQiXsJAryqWmqWrwFxY8I",
-        "PyCon.KR 2022": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRnlqQwMj-WNlrsac7yTiVhk",
-        "PyCon.KR 2020": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRk9wIL9rZekFLIfT3aVcHT7",
-        "PyCon.KR 2019": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRlECdmkJ7M8konKB0NhBfve",
-        "PyCon.KR 2018": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRmnMr5yucZ9Eu-yVhjRRsOM",
-        "PyCon.KR 2017": "https://www.youtube.com/playlist?list=PLZPhyNeJvHRmvCnWMBZJiFXu9kDUcn5FG",
-        "PyCon.KR 2016(APAC)": "https://www.youtube.com/watch?v=UWDRX4z4-k0&list=PLZPhyNeJvHRnSJ2sAnqCGFnVRKo98EgCp",
-        "PyCon.KR 2015": "https://www.youtube.com/watch?v=0abmVNlkxRo&list=PLZPhyNeJvHRnoO_m1hH78j0JRj8LgUICN",
-        "PyCon.KR 2014": "https://www.youtube.com/watch?v=krK5Ei6kFoc&list=PLZPhyNeJvHRnchPDpnFV1uUmLhR_JG3A8"
-    }
-    
-    logger.info("🚀 PyCon KR 모든 연도 플레이리스트 수집 시작")
-    
-    # 데이터베이스 초기화
-    init_database()
-    
-    total_collected = 0
-    success_count = 0
-    error_count = 0
-    
-    for year, playlist_url in playlists.items():
-        try:
-            logger.info(f"📋 {year} 플레이리스트 처리 중...")
-            logger.info(f"   URL: {playlist_url}")
-            
-            # 영상 수집
-            collected_videos = get_video_urls_from_playlist(playlist_url)
-            video_count = len(collected_videos)
-            
-            total_collected += video_count
-            success_count += 1
-            
-            logger.info(f"✅ {year}: {video_count}개 영상 수집 완료")
-            
-            # 처음 3개 영상 제목 미리보기
-            if collected_videos:
-                logger.info(f"   미리보기:")
-                for i, video in enumerate(collected_videos[:3], 1):
-                    logger.info(f"     {i}. {video['title'][:60]}...")
-                if len(collected_videos) > 3:
-                    logger.info(f"     ... 및 {len(collected_videos) - 3}개 더")
-            
-        except Exception as e:
-            error_count += 1
-            logger.error(f"❌ {year} 처리 실패: {str(e)}")
-            continue
+    # 모든 플레이리스트의 영상을 한 번의 트랜잭션으로 저장
+    if all_videos:
+        save_video_urls(all_videos)
+        mark_playlists_fetched(fetched_urls)
     
     # 최종 요약
-    logger.info(f"🎉 전체 수집 완료!")
-    logger.info(f"   ✅ 성공한 플레이리스트: {success_count}개")
-    logger.info(f"   ❌ 실패한 플레이리스트: {error_count}개")
-    logger.info(f"   📊 총 수집된 영상: {total_collected}개")
+    logger.info("🎉 전체 수집 완료!")
+    logger.info("   ✅ 성공한 플레이리스트: {}개", success_count)
+    logger.info("   ❌ 실패한 플레이리스트: {}개", error_count)
+    logger.info("   📊 총 수집된 영상: {}개", total_collected)
     
     # 데이터베이스 전체 통계
     show_final_database_stats()
@@ -221,52 +213,31 @@ if __name__ == "__main__":
 def show_final_database_stats():
     """최종 데이터베이스 통계 표시"""
     try:
-        all_videos = get_all_collected_videos()
+        total_count, year_stats, source_stats, channel_stats = get_collection_stats()
         
         logger.info(f"📈 데이터베이스 최종 통계:")
-        logger.info(f"   📺 총 저장된 영상: {len(all_videos)}개")
-        
-        # 연도별 통계
-        year_stats = {}
-        source_stats = {}
-        channel_stats = {}
-        
-        for video in all_videos:
-            # 소스 URL에서 연도 추출 시도
-            source_url = video.get('source_url', '')
-            if 'pycon' in source_url.lower():
-                for year in ['2024', '2023', '2022', '2021', '2020', '2019', '2018', '2017', '2016', '2015', '2014']:
-                    if year in source_url:
-                        year_key = f"PyCon KR {year}"
-                        year_stats[year_key] = year_stats.get(year_key, 0) + 1
-                        break
-            
-            # 소스 타입별 통계
-            source_type = video.get('source_type', 'unknown')
-            source_stats[source_type] = source_stats.get(source_type, 0) + 1
-            
-            # 채널별 통계
-            channel = video.get('channel_name', 'Unknown')
-            channel_stats[channel] = channel_stats.get(channel, 0) + 1
+        logger.info(f"   📺 총 저장된 영상: {total_count}개")
         
         if year_stats:
             logger.info(f"   🎯 연도별 분포:")
-            for year, count in sorted(year_stats.items(), key=lambda x: x[0], reverse=True):
-                logger.info(f"     - {year}: {count}개")
+            for year, count in year_stats:
+                logger.info(f"     - PyCon KR {year}: {count}개")
         
         if source_stats:
             logger.info(f"   📋 소스 타입별:")
-            for source_type, count in source_stats.items():
+            for source_type, count in source_stats:
                 logger.info(f"     - {source_type}: {count}개")
         
         if channel_stats:
             logger.info(f"   📺 주요 채널:")
-            sorted_channels = sorted(channel_stats.items(), key=lambda x: x[1], reverse=True)
-            for channel, count in sorted_channels[:5]:  # 상위 5개 채널만 표시
+            for channel, count in channel_stats:
                 logger.info(f"     - {channel}: {count}개")
         
     except Exception as e:
         logger.error(f"통계 생성 오류: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(collect_all_pycon_playlists())
+    # 플레이리스트 페이지 요청에 keep-alive 세션 사용
+    install_pytube_session()
+    # --force: 캐시를 무시하고 모든 플레이리스트를 다시 수집
+    asyncio.run(collect_all_pycon_playlists(force="--force" in sys.argv))
@@ -22,12 +22,19 @@ def show_database_stats():
         print("📊 YouTube MCP 데이터베이스 통계")
         print("=" * 40)
         
-        # 기본 URL 통계
+        # 기본 URL 통계 (video_details 테이블이 아직 없어도 출력되도록 따로 조회)
         url_count = conn.execute("SELECT COUNT(*) FROM video_urls").fetchone()[0]
         print(f"🔗 수집된 URL 수: {url_count}개")
         
-        # 상세 정보 통계
-        detail_count = conn.execute("SELECT COUNT(*) FROM video_details").fetchone()[0]
+        # 상세 정보 통계를 한 번에 조회
+        detail_count, total_views, avg_views, total_duration = conn.execute("""
+            SELECT
+                COUNT(*) AS detail_count,
+                SUM(view_count) AS total_views,
+                AVG(view_count) AS avg_views,
+                SUM(duration) AS total_duration
+            FROM video_details
+        """).fetchone()
         print(f"📹 상세 정보 보유: {detail_count}개")
         
         if detail_count > 0:
@@ -45,15 +52,6 @@ def show_database_stats():
                 print(f"   - {conf_name} {conf_year}: {count}개")
             
             # 총 통계
-            total_stats = conn.execute("""
-                SELECT 
-                    SUM(view_count) as total_views,
-                    AVG(view_count) as avg_views,
-                    SUM(duration) as total_duration
-                FROM video_details
-            """).fetchone()
-            
-            total_views, avg_views, total_duration = total_stats
             print(f"👁️ 총 조회수: {total_views:,}")
             print(f"📊 평균 조회수: {avg_views:.0f}")
             print(f"⏱️ 총 재생시간: {total_duration/3600:.1f}시간")
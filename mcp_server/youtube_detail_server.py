@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
+import functools
 import re
+import threading
 from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 import duckdb
 from pathlib import Path
 
@@ -24,6 +25,33 @@ logger.add("youtube_detail_mcp.log", rotation="10 MB", level="INFO")
 
 # Database setup
 DB_PATH = Path("youtube_videos.db")
+# Every call opens its own connection, so the path string is computed once here
+DB_PATH_STR = str(DB_PATH)
+
+# Maximum number of concurrent yt-dlp extractions (avoids YouTube rate limiting)
+EXTRACT_CONCURRENCY = 8
+
+# yt-dlp options; each worker thread keeps one YoutubeDL instance (see _get_ydl)
+# so extractor setup and HTTP connections are reused across videos.
+# Only metadata is stored, so skip manifests, comments and subtitles
+YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    'skip_download': True,
+    'noplaylist': True,
+    'youtube_include_dash_manifest': False,
+    'youtube_include_hls_manifest': False,
+    'getcomments': False,
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+}
+_ydl_local = threading.local()
+
+# Each call opens its own DuckDB connection and closes it when done, so the file
+# lock is released between calls and the URL server / duckdb MCP server can share
+# the database; writes within this process are serialized by _DB_LOCK
+_DB_LOCK = threading.Lock()
 
 # 임시 NotificationOptions 클래스 정의
 class NotificationOptions:
@@ -31,99 +59,185 @@ class NotificationOptions:
     resources_changed = None
     tools_changed = None
 
+def _table_exists(conn: duckdb.DuckDBPyConnection, table_name: str) -> bool:
+    """Check whether a table exists in the database"""
+    return conn.execute("""
+        SELECT 1 FROM information_schema.tables WHERE table_name = ?
+    """, (table_name,)).fetchone() is not None
+
+def init_conference_stats_table(conn: duckdb.DuckDBPyConnection):
+    """Initialize the per-conference summary table, backfilling it from video_details"""
+    if _table_exists(conn, 'conference_stats'):
+        if conn.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'conference_stats' AND column_name = 'viewed_count'
+        """).fetchone():
+            return
+        # Summary from before viewed_count was tracked; it is derived data, so rebuild it
+        conn.execute("DROP TABLE conference_stats")
+    
+    # Unclassified videos are kept under '' / 0 since key columns cannot be NULL;
+    # they still count towards the overall statistics
+    conn.execute("""
+        CREATE TABLE conference_stats (
+            conference_name TEXT NOT NULL,
+            conference_year INTEGER NOT NULL,
+            video_count BIGINT,
+            viewed_count BIGINT,  -- videos with a non-NULL view_count
+            total_views BIGINT,
+            total_duration BIGINT,
+            PRIMARY KEY (conference_name, conference_year)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO conference_stats
+        SELECT
+            coalesce(conference_name, ''),
+            coalesce(conference_year, 0),
+            COUNT(*),
+            COUNT(view_count),
+            coalesce(SUM(view_count), 0),
+            coalesce(SUM(duration), 0)
+        FROM video_details
+        GROUP BY ALL
+    """)
+    logger.info("Conference stats table initialized")
+
 def init_video_details_table():
-    """Initialize video details table in DuckDB"""
-    conn = duckdb.connect(str(DB_PATH))
+    """Initialize video details table in DuckDB, keeping any existing data"""
     try:
-        # Drop table if exists and recreate with proper sequence
-        conn.execute("DROP TABLE IF EXISTS video_details")
-        conn.execute("DROP SEQUENCE IF EXISTS video_details_id_seq")
-        
-        # Create sequence for auto-increment
-        conn.execute("CREATE SEQUENCE video_details_id_seq")
-        
-        # Create table with proper auto-increment
-        conn.execute("""
-            CREATE TABLE video_details (
-                id INTEGER DEFAULT nextval('video_details_id_seq') PRIMARY KEY,
-                video_url TEXT UNIQUE,
-                video_id TEXT,
-                title TEXT,
-                description TEXT,
-                channel_name TEXT,
-                upload_date TEXT,
-                duration INTEGER,
-                view_count INTEGER,
-                like_count INTEGER,
-                comment_count INTEGER,
-                conference_name TEXT,
-                conference_year INTEGER,
-                tags TEXT,
-                thumbnail_url TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        with duckdb.connect(DB_PATH_STR) as conn:
+            # Every step is idempotent, so existing databases are brought up to date
+            # and a warm start only touches the catalog
+            
+            # Create sequence for auto-increment
+            conn.execute("CREATE SEQUENCE IF NOT EXISTS video_details_id_seq")
+            
+            # Create table with proper auto-increment
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS video_details (
+                    id INTEGER DEFAULT nextval('video_details_id_seq') PRIMARY KEY,
+                    video_url TEXT UNIQUE,
+                    video_id TEXT,
+                    title TEXT,
+                    description TEXT,
+                    channel_name TEXT,
+                    upload_date TEXT,
+                    duration INTEGER,
+                    view_count INTEGER,
+                    like_count INTEGER,
+                    comment_count INTEGER,
+                    conference_name TEXT,
+                    conference_year INTEGER,
+                    tags VARCHAR[],
+                    thumbnail_url TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # No index on the conference columns: DuckDB's planner does not use it for
+            # the conference filters (a leading-wildcard LIKE, and even plain equality on
+            # 200k rows, still plan a sequential scan), while it costs maintenance on every
+            # bulk save and blocks ALTER ... TYPE on the table. Drop it from older databases
+            conn.execute("DROP INDEX IF EXISTS idx_video_details_conference")
+            
+            # Older databases stored tags as a JSON string; convert them to a list.
+            # Values that are not JSON are DuckDB list text written into the old column
+            tags_type = conn.execute("""
+                SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'video_details' AND column_name = 'tags'
+            """).fetchone()
+            if tags_type and tags_type[0] == 'VARCHAR':
+                conn.execute("""
+                    ALTER TABLE video_details ALTER tags TYPE VARCHAR[] USING
+                        CASE
+                            WHEN json_valid(tags) THEN from_json(tags, '["VARCHAR"]')
+                            ELSE TRY_CAST(NULLIF(tags, '') AS VARCHAR[])
+                        END
+                """)
+                logger.info("Migrated video_details.tags to VARCHAR[]")
+            
+            init_conference_stats_table(conn)
         logger.info("Video details table initialized")
     except Exception as e:
         logger.error(f"Error initializing video details table: {e}")
         raise
-    finally:
-        conn.close()
 
-def extract_conference_info(title: str, description: str, channel_name: str) -> tuple[Optional[str], Optional[int]]:
-    """Extract conference name and year from video metadata"""
+# Conference keywords combined into one alternation with a named group per
+# conference, so the text is scanned once; the leftmost keyword in the text wins
+_CONF_RE = re.compile(
+    r'(?P<pycon_kr>pycon\s*kr|pycon\s*korea|파이콘)'
+    r'|(?P<python_conference>python\s*conference)'
+    r'|(?P<djangocon>djangocon)'
+    r'|(?P<europython>europython)'
+    r'|(?P<pycascades>pycascades)'
+    r'|(?P<scipy>scipy)'
+    r'|(?P<jupytercon>jupyter\s*con)'
+)
+_CONF_NAMES = {
+    'pycon_kr': "PyCon KR",
+    'python_conference': "Python Conference",
+    'djangocon': "DjangoCon",
+    'europython': "EuroPython",
+    'pycascades': "PyCascades",
+    'scipy': "SciPy",
+    'jupytercon': "JupyterCon",
+}
+# Literal substrings, one of which every conference keyword contains; checked with
+# str.__contains__ before running the regex
+_CONF_PREFILTER = ("pycon", "python", "파이콘", "djangocon", "europython", "pycascades", "scipy", "jupyter")
+# Year written right after the conference keyword
+_CONF_YEAR_RE = re.compile(r'\s*(\d{4})')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
+# Conference names and years almost always appear in the title or the start of the
+# description, so only this many description characters are scanned at first
+DESCRIPTION_SCAN_CHARS = 200
+
+def _scan_conference_info(text_to_analyze: str) -> tuple[Optional[str], Optional[int]]:
+    """Find the first conference keyword and a year in lowercased text"""
     conference_name = None
     conference_year = None
     
-    # Combine all text for analysis
-    text_to_analyze = f"{title} {description} {channel_name}".lower()
-    
-    # Conference name patterns
-    conference_patterns = [
-        r'pycon\s*kr\s*(\d{4})?',
-        r'pycon\s*korea\s*(\d{4})?',
-        r'python\s*conference\s*(\d{4})?',
-        r'파이콘\s*(\d{4})?',
-        r'djangocon\s*(\d{4})?',
-        r'europython\s*(\d{4})?',
-        r'pycascades\s*(\d{4})?',
-        r'scipy\s*(\d{4})?',
-        r'jupyter\s*con\s*(\d{4})?',
-    ]
-    
-    # Extract conference name and year
-    for pattern in conference_patterns:
-        match = re.search(pattern, text_to_analyze)
-        if match:
-            if 'pycon' in pattern:
-                if 'kr' in pattern or 'korea' in pattern or '파이콘' in pattern:
-                    conference_name = "PyCon KR"
-                else:
-                    conference_name = "PyCon"
-            elif 'django' in pattern:
-                conference_name = "DjangoCon"
-            elif 'europython' in pattern:
-                conference_name = "EuroPython"
-            elif 'pycascades' in pattern:
-                conference_name = "PyCascades"
-            elif 'scipy' in pattern:
-                conference_name = "SciPy"
-            elif 'jupyter' in pattern:
-                conference_name = "JupyterCon"
-            else:
-                conference_name = "Python Conference"
-            
-            # Extract year if captured
-            if match.group(1):
-                conference_year = int(match.group(1))
-            break
+    # Extract conference name and year, skipping the regex when no keyword can match
+    match = None
+    if any(keyword in text_to_analyze for keyword in _CONF_PREFILTER):
+        match = _CONF_RE.search(text_to_analyze)
+    if match:
+        conference_name = _CONF_NAMES[match.lastgroup]
+        
+        # Extract year if it follows the conference name
+        year_match = _CONF_YEAR_RE.match(text_to_analyze, match.end())
+        if year_match:
+            conference_year = int(year_match.group(1))
     
     # If no conference found, try to extract year separately
     if conference_year is None:
-        year_match = re.search(r'\b(20\d{2})\b', text_to_analyze)
+        year_match = _YEAR_RE.search(text_to_analyze)
         if year_match:
             conference_year = int(year_match.group(1))
     
+    return conference_name, conference_year
+
+def extract_conference_info(title: str, description: str, channel_name: str) -> tuple[Optional[str], Optional[int]]:
+    """Extract conference name and year from video metadata"""
+    description = description or ''
+    
+    # Scan the title, the start of the description and the channel name first
+    conference_name, conference_year = _scan_conference_info(
+        f"{title} {description[:DESCRIPTION_SCAN_CHARS]} {channel_name}".lower()
+    )
+    
+    # Fall back to the full description only for whatever is still missing
+    if (conference_name is None or conference_year is None) and len(description) > DESCRIPTION_SCAN_CHARS:
+        full_name, full_year = _scan_conference_info(f"{title} {description} {channel_name}".lower())
+        if conference_name is None and full_name is not None:
+            # A conference found only by the full scan takes its year from that scan too,
+            # so a year written after the keyword wins over an unrelated bare year
+            conference_name, conference_year = full_name, full_year
+        else:
+            conference_year = conference_year or full_year
+    
     # Try to detect from channel name patterns
     if conference_name is None:
         if any(keyword in channel_name.lower() for keyword in ['pycon', '파이콘', 'python']):
@@ -134,99 +248,219 @@ def extract_conference_info(title: str, description: str, channel_name: str) ->
     
     return conference_name, conference_year
 
-def get_video_details_with_ytdlp(video_url: str) -> Dict[str, Any]:
-    """Get detailed video information using yt-dlp"""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,
-    }
+def extract_video_id(video_url: str) -> Optional[str]:
+    """Extract the YouTube video ID from a watch, youtu.be, shorts or embed URL"""
+    parsed = urlparse(video_url)
     
+    if parsed.netloc.endswith('youtu.be'):
+        return parsed.path.strip('/').split('/')[0] or None
+    
+    video_ids = parse_qs(parsed.query).get('v')
+    if video_ids:
+        return video_ids[0]
+    
+    path_parts = parsed.path.strip('/').split('/')
+    if len(path_parts) >= 2 and path_parts[0] in ('shorts', 'embed', 'live', 'v'):
+        return path_parts[1]
+    return None
+
+def get_stored_video_details(video_id: str, video_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Get previously saved details for a video ID, or None if not stored
+
+    When several URLs of the video are stored, the row saved under video_url is preferred;
+    'stored_urls' lists every URL the video is saved under.
+    """
+    # Called from worker threads; each call uses its own short-lived connection
+    with duckdb.connect(DB_PATH_STR) as conn:
+        row = conn.execute("""
+            SELECT video_url, video_id, title, description, channel_name, upload_date,
+                   duration, view_count, like_count, comment_count, conference_name,
+                   conference_year, tags, thumbnail_url,
+                   list(video_url) OVER () AS stored_urls
+            FROM video_details
+            -- Rows without a title are failed extractions, not usable cached details
+            WHERE video_id = $1 AND coalesce(title, '') <> ''
+            ORDER BY video_url IS NOT DISTINCT FROM $2 DESC
+            LIMIT 1
+        """, (video_id, video_url)).fetchone()
+    
+    if row is None:
+        return None
+    return dict(zip((
+        'video_url', 'video_id', 'title', 'description', 'channel_name', 'upload_date',
+        'duration', 'view_count', 'like_count', 'comment_count', 'conference_name',
+        'conference_year', 'tags', 'thumbnail_url', 'stored_urls',
+    ), row))
+
+def get_video_details_with_ytdlp(video_url: str, refresh: bool = False) -> Dict[str, Any]:
+    """Get detailed video information, reusing stored or cached results by video ID
+
+    With refresh=True the video is always fetched again with yt-dlp. 'stored_urls' lists
+    the URLs the video is already saved under, and is empty for freshly extracted details.
+    """
+    video_id = extract_video_id(video_url)
+    if video_id is None or refresh:
+        return {**_extract_video_details(video_url), 'stored_urls': []}
+    
+    video_details = get_stored_video_details(video_id, video_url) or {
+        **_extract_video_details_by_id(video_id), 'stored_urls': []
+    }
+    return {**video_details, 'video_url': video_url}
+
+@functools.lru_cache(maxsize=1024)
+def _extract_video_details_by_id(video_id: str) -> Dict[str, Any]:
+    """Extract video details once per video ID, so URL variants share one request"""
+    return _extract_video_details(f"https://www.youtube.com/watch?v={video_id}")
+
+def _get_ydl() -> yt_dlp.YoutubeDL:
+    """Return this thread's YoutubeDL instance, creating it on first use"""
+    ydl = getattr(_ydl_local, 'ydl', None)
+    if ydl is None:
+        ydl = _ydl_local.ydl = yt_dlp.YoutubeDL(YDL_OPTS)
+    return ydl
+
+def _extract_video_details(video_url: str) -> Dict[str, Any]:
+    """Get detailed video information using yt-dlp"""
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            logger.info(f"Extracting details for: {video_url}")
-            info = ydl.extract_info(video_url, download=False)
+        logger.info(f"Extracting details for: {video_url}")
+        info = _get_ydl().extract_info(video_url, download=False)
+        
+        # Extract conference information
+        title = info.get('title', '')
+        description = info.get('description', '')
+        channel_name = info.get('uploader', '') or info.get('channel', '')
+        
+        conference_name, conference_year = extract_conference_info(title, description, channel_name)
+        
+        video_details = {
+            'video_url': video_url,
+            'video_id': info.get('id', ''),
+            'title': title,
+            'description': description or '',
+            'channel_name': channel_name,
+            'upload_date': info.get('upload_date', ''),
+            'duration': info.get('duration', 0),
+            'view_count': info.get('view_count', 0),
+            'like_count': info.get('like_count', 0),
+            'comment_count': info.get('comment_count', 0),
+            'conference_name': conference_name,
+            'conference_year': conference_year,
+            'tags': info.get('tags') or [],
+            'thumbnail_url': info.get('thumbnail', ''),
+        }
+        
+        logger.info(f"Successfully extracted details for video: {title}")
+        return video_details
+        
+    except Exception as e:
+        logger.error(f"Error extracting video details for {video_url}: {e}")
+        raise
+
+def _video_details_row(video_details: Dict[str, Any]) -> tuple:
+    """Convert a video details dict into a row for the INSERT below"""
+    return (
+        video_details['video_url'],
+        video_details['video_id'],
+        video_details['title'],
+        video_details['description'],
+        video_details['channel_name'],
+        video_details['upload_date'],
+        video_details['duration'],
+        video_details['view_count'],
+        video_details['like_count'],
+        video_details['comment_count'],
+        video_details['conference_name'],
+        video_details['conference_year'],
+        video_details['tags'],
+        video_details['thumbnail_url'],
+    )
+
+# Adds (sign = 1) or removes (sign = -1) the given videos' contribution to conference_stats
+CONFERENCE_STATS_DELTA_QUERY = """
+    INSERT INTO conference_stats
+    SELECT
+        coalesce(conference_name, ''),
+        coalesce(conference_year, 0),
+        $2 * COUNT(*),
+        $2 * COUNT(view_count),
+        $2 * coalesce(SUM(view_count), 0),
+        $2 * coalesce(SUM(duration), 0)
+    FROM video_details
+    WHERE video_url IN (SELECT UNNEST($1))
+    GROUP BY ALL
+    ON CONFLICT DO UPDATE SET
+        video_count = video_count + EXCLUDED.video_count,
+        viewed_count = viewed_count + EXCLUDED.viewed_count,
+        total_views = total_views + EXCLUDED.total_views,
+        total_duration = total_duration + EXCLUDED.total_duration
+"""
+
+def save_video_details_bulk(rows: List[Dict[str, Any]]):
+    """Save a batch of video details to DuckDB"""
+    if not rows:
+        return
+    
+    # Keep only the last details per URL so the batch never violates video_url UNIQUE
+    rows = list({row['video_url']: row for row in rows}.values())
+    
+    with _DB_LOCK, duckdb.connect(DB_PATH_STR) as conn:
+        try:
+            # Replace the whole batch atomically in a single transaction
+            conn.execute("BEGIN TRANSACTION")
             
-            # Extract conference information
-            title = info.get('title', '')
-            description = info.get('description', '')
-            channel_name = info.get('uploader', '') or info.get('channel', '')
+            video_urls = [row['video_url'] for row in rows]
             
-            conference_name, conference_year = extract_conference_info(title, description, channel_name)
+            # First delete existing records for the whole batch, passing the URLs
+            # as one list parameter so the statement text is the same for every batch
+            conn.execute(CONFERENCE_STATS_DELTA_QUERY, [video_urls, -1])
+            conn.execute(
+                "DELETE FROM video_details WHERE video_url IN (SELECT UNNEST(?))",
+                [video_urls]
+            )
             
-            video_details = {
-                'video_url': video_url,
-                'video_id': info.get('id', ''),
-                'title': title,
-                'description': description or '',
-                'channel_name': channel_name,
-                'upload_date': info.get('upload_date', ''),
-                'duration': info.get('duration', 0),
-                'view_count': info.get('view_count', 0),
-                'like_count': info.get('like_count', 0),
-                'comment_count': info.get('comment_count', 0),
-                'conference_name': conference_name,
-                'conference_year': conference_year,
-                'tags': json.dumps(info.get('tags', [])),
-                'thumbnail_url': info.get('thumbnail', ''),
-            }
+            # Then insert the new records
+            conn.executemany("""
+                INSERT INTO video_details 
+                (video_url, video_id, title, description, channel_name, upload_date, 
+                 duration, view_count, like_count, comment_count, conference_name, 
+                 conference_year, tags, thumbnail_url)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [_video_details_row(row) for row in rows])
             
-            logger.info(f"Successfully extracted details for video: {title}")
-            return video_details
+            # Keep the conference summary in step with the replaced rows
+            conn.execute(CONFERENCE_STATS_DELTA_QUERY, [video_urls, 1])
+            conn.execute("DELETE FROM conference_stats WHERE video_count = 0")
             
-    except Exception as e:
-        logger.error(f"Error extracting video details for {video_url}: {e}")
-        raise
+            conn.execute("COMMIT")
+            logger.info(f"Saved video details for {len(rows)} videos")
+        except Exception as e:
+            logger.error(f"Error saving video details: {e}")
+            # A failed COMMIT has already aborted the transaction, so there may be
+            # nothing left to roll back
+            try:
+                conn.execute("ROLLBACK")
+            except duckdb.Error:
+                pass
+            raise
 
 def save_video_details(video_details: Dict[str, Any]):
     """Save video details to DuckDB"""
-    conn = duckdb.connect(str(DB_PATH))
-    try:
-        # First try to delete existing record if any
-        conn.execute("DELETE FROM video_details WHERE video_url = ?", (video_details['video_url'],))
-        
-        # Then insert the new record
-        conn.execute("""
-            INSERT INTO video_details 
-            (video_url, video_id, title, description, channel_name, upload_date, 
-             duration, view_count, like_count, comment_count, conference_name, 
-             conference_year, tags, thumbnail_url)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            video_details['video_url'],
-            video_details['video_id'],
-            video_details['title'],
-            video_details['description'],
-            video_details['channel_name'],
-            video_details['upload_date'],
-            video_details['duration'],
-            video_details['view_count'],
-            video_details['like_count'],
-            video_details['comment_count'],
-            video_details['conference_name'],
-            video_details['conference_year'],
-            video_details['tags'],
-            video_details['thumbnail_url'],
-        ))
-        logger.info(f"Saved video details for: {video_details['title']}")
-    except Exception as e:
-        logger.error(f"Error saving video details: {e}")
-        raise
-    finally:
-        conn.close()
+    save_video_details_bulk([video_details])
 
 def get_unprocessed_video_urls() -> List[str]:
     """Get video URLs that haven't been processed for details yet"""
-    conn = duckdb.connect(str(DB_PATH))
     try:
         # Get URLs from video_urls table that are not in video_details table
-        result = conn.execute("""
-            SELECT DISTINCT v.url
-            FROM video_urls v
-            LEFT JOIN video_details vd ON v.url = vd.video_url
-            WHERE vd.video_url IS NULL
-            ORDER BY v.collected_at DESC
-        """).fetchall()
+        # video_urls.url is UNIQUE, so no DISTINCT is needed for the anti-join
+        with duckdb.connect(DB_PATH_STR) as conn:
+            result = conn.execute("""
+                SELECT v.url
+                FROM video_urls v
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM video_details vd WHERE vd.video_url = v.url
+                )
+                ORDER BY v.collected_at DESC
+            """).fetchall()
         
         urls = [row[0] for row in result]
         logger.info(f"Found {len(urls)} unprocessed video URLs")
@@ -235,8 +469,61 @@ def get_unprocessed_video_urls() -> List[str]:
     except Exception as e:
         logger.error(f"Error getting unprocessed URLs: {e}")
         return []
-    finally:
-        conn.close()
+
+async def extract_details_concurrently(video_urls: List[str]) -> List[Any]:
+    """Extract details for many videos in worker threads, returning details or exceptions in input order
+
+    URLs are grouped by video ID so each video is extracted once, even when the batch
+    holds several URL variants of it; the result is then fanned out to every URL.
+    """
+    semaphore = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+    
+    async def extract_one(video_url: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await asyncio.to_thread(get_video_details_with_ytdlp, video_url)
+    
+    # First URL seen for each video ID; URLs without a recognisable ID stand alone
+    video_keys = [extract_video_id(video_url) or video_url for video_url in video_urls]
+    first_urls = {}
+    for video_key, video_url in zip(video_keys, video_urls):
+        first_urls.setdefault(video_key, video_url)
+    
+    extracted = dict(zip(first_urls, await asyncio.gather(
+        *(extract_one(video_url) for video_url in first_urls.values()),
+        return_exceptions=True
+    )))
+    
+    results = []
+    for video_key, video_url in zip(video_keys, video_urls):
+        video_details = extracted[video_key]
+        if not isinstance(video_details, Exception):
+            video_details = {**video_details, 'video_url': video_url}
+        results.append(video_details)
+    return results
+
+# Stored video details query; $1 (conference name substring) and $2 (year) are optional filters
+# Each row is formatted into its display card by DuckDB so only one string column is fetched
+VIDEO_DETAILS_QUERY = """
+    SELECT format(
+        '📹 {}\n'
+        '   🎯 Conference: {} ({})\n'
+        '   📺 Channel: {}\n'
+        '   👁️ Views: {:,} | ⏱️ Duration: {}s\n'
+        '   🔗 {}\n',
+        coalesce(title, ''),
+        coalesce(conference_name, '?'),
+        coalesce(CAST(conference_year AS VARCHAR), '?'),
+        coalesce(channel_name, ''),
+        coalesce(view_count, 0),
+        coalesce(duration, 0),
+        video_url
+    ) AS card
+    FROM video_details
+    WHERE (CAST($1 AS VARCHAR) IS NULL OR conference_name LIKE '%' || $1 || '%')
+      AND (CAST($2 AS INTEGER) IS NULL OR conference_year = $2)
+    ORDER BY view_count DESC
+    LIMIT $3
+"""
 
 # Initialize database on startup
 init_video_details_table()
@@ -330,7 +617,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     if name == "extract_video_details":
         video_url = arguments["video_url"]
         try:
-            video_details = get_video_details_with_ytdlp(video_url)
+            video_details = get_video_details_with_ytdlp(video_url, refresh=True)
             save_video_details(video_details)
             
             return [TextContent(
@@ -350,17 +637,26 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         success_count = 0
         error_count = 0
         results = []
+        extracted = []
         
-        for video_url in video_urls:
-            try:
-                video_details = get_video_details_with_ytdlp(video_url)
-                save_video_details(video_details)
+        for video_url, video_details in zip(video_urls, await extract_details_concurrently(video_urls)):
+            if isinstance(video_details, Exception):
+                error_count += 1
+                results.append(f"❌ {video_url}: {str(video_details)}")
+                logger.error(f"Error processing {video_url}: {video_details}")
+            else:
+                # Details already saved under this URL are not written again
+                if video_url not in video_details['stored_urls']:
+                    extracted.append(video_details)
                 success_count += 1
                 results.append(f"✅ {video_details['title']}")
-            except Exception as e:
-                error_count += 1
-                results.append(f"❌ {video_url}: {str(e)}")
-                logger.error(f"Error processing {video_url}: {e}")
+        
+        # Save all extracted details at once
+        try:
+            save_video_details_bulk(extracted)
+        except Exception as e:
+            logger.error(f"Error in batch_extract_details: {e}")
+            raise RuntimeError(str(e))
         
         return [TextContent(
             type="text",
@@ -382,25 +678,40 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
                     text="No unprocessed videos found."
                 )]
             
+            # Skip URLs classified since the unprocessed query ran (e.g. by a concurrent
+            # batch_extract_details call) so they never reach yt-dlp
+            with duckdb.connect(DB_PATH_STR) as conn:
+                classified_urls = {row[0] for row in conn.execute("""
+                    SELECT video_url FROM video_details
+                    WHERE conference_name IS NOT NULL AND video_url IN (SELECT UNNEST(?))
+                """, [urls_to_process]).fetchall()}
+            urls_to_extract = [url for url in urls_to_process if url not in classified_urls]
+            
             success_count = 0
             error_count = 0
-            results = []
+            results = [f"⏭️ {video_url}: already classified" for video_url in classified_urls]
+            extracted = []
             
-            for video_url in urls_to_process:
-                try:
-                    video_details = get_video_details_with_ytdlp(video_url)
-                    save_video_details(video_details)
+            for video_url, video_details in zip(urls_to_extract, await extract_details_concurrently(urls_to_extract)):
+                if isinstance(video_details, Exception):
+                    error_count += 1
+                    results.append(f"❌ {video_url}: {str(video_details)[:50]}...")
+                    logger.error(f"Error processing {video_url}: {video_details}")
+                else:
+                    # Details already saved under this URL are not written again
+                    if video_url not in video_details['stored_urls']:
+                        extracted.append(video_details)
                     success_count += 1
                     results.append(f"✅ {video_details['title'][:50]}...")
-                except Exception as e:
-                    error_count += 1
-                    results.append(f"❌ {video_url}: {str(e)[:50]}...")
-                    logger.error(f"Error processing {video_url}: {e}")
+            
+            # Save all extracted details at once
+            save_video_details_bulk(extracted)
             
             return [TextContent(
                 type="text",
                 text=f"Processed {len(urls_to_process)} unprocessed videos:\n"
                      f"✅ Success: {success_count}\n"
+                     f"⏭️ Skipped: {len(classified_urls)}\n"
                      f"❌ Errors: {error_count}\n\n"
                      f"Results:\n" + "\n".join(results[:10])
             )]
@@ -414,25 +725,12 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         limit = arguments.get("limit", 20)
         
         try:
-            conn = duckdb.connect(str(DB_PATH))
-            
-            # Build query
-            query = "SELECT title, conference_name, conference_year, channel_name, view_count, duration, video_url FROM video_details WHERE 1=1"
-            params = []
-            
-            if conference_name:
-                query += " AND conference_name LIKE ?"
-                params.append(f"%{conference_name}%")
-            
-            if conference_year:
-                query += " AND conference_year = ?"
-                params.append(conference_year)
-            
-            query += " ORDER BY view_count DESC LIMIT ?"
-            params.append(limit)
-            
-            result = conn.execute(query, params).fetchall()
-            conn.close()
+            # Unset filters are passed as NULL so the same statement serves every combination
+            with duckdb.connect(DB_PATH_STR) as conn:
+                result = conn.execute(
+                    VIDEO_DETAILS_QUERY,
+                    [conference_name or None, conference_year or None, limit]
+                ).fetchall()
             
             if not result:
                 return [TextContent(
@@ -440,14 +738,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
                     text="No video details found matching the criteria."
                 )]
             
-            videos_text = "\n".join([
-                f"📹 {row[0]}\n"
-                f"   🎯 Conference: {row[1]} ({row[2]})\n"
-                f"   📺 Channel: {row[3]}\n"
-                f"   👁️ Views: {row[4]:,} | ⏱️ Duration: {row[5]}s\n"
-                f"   🔗 {row[6]}\n"
-                for row in result
-            ])
+            videos_text = "\n".join(row[0] for row in result)
             
             return [TextContent(
                 type="text",
@@ -459,47 +750,61 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     
     elif name == "get_conference_statistics":
         try:
-            conn = duckdb.connect(str(DB_PATH))
+            # Per-conference and overall statistics from the conference_stats summary
+            # instead of scanning video_details;
+            # grouping_id is 3 for the overall row and 0 for per-conference rows
+            with duckdb.connect(DB_PATH_STR) as conn:
+                stats_rows = conn.execute("""
+                    SELECT 
+                        GROUPING(conference_name, conference_year) as grouping_id,
+                        conference_name,
+                        conference_year,
+                        SUM(video_count) as video_count,
+                        COUNT(DISTINCT conference_name) as unique_conferences,
+                        COUNT(DISTINCT conference_year) as unique_years,
+                        -- Like AVG(view_count), videos without a view count are left out
+                        SUM(total_views) / NULLIF(SUM(viewed_count), 0) as avg_views,
+                        SUM(total_duration) as total_duration
+                    FROM (
+                        SELECT 
+                            NULLIF(conference_name, '') as conference_name,
+                            NULLIF(conference_year, 0) as conference_year,
+                            video_count,
+                            viewed_count,
+                            total_views,
+                            total_duration
+                        FROM conference_stats
+                    )
+                    GROUP BY GROUPING SETS ((conference_name, conference_year), ())
+                    HAVING grouping_id = 3 OR conference_name IS NOT NULL
+                    ORDER BY grouping_id DESC, conference_year DESC, video_count DESC
+                """).fetchall()
             
-            # Conference statistics
-            conf_stats = conn.execute("""
-                SELECT 
-                    conference_name,
-                    conference_year,
-                    COUNT(*) as video_count,
-                    AVG(view_count) as avg_views,
-                    SUM(duration) as total_duration
-                FROM video_details 
-                WHERE conference_name IS NOT NULL
-                GROUP BY conference_name, conference_year
-                ORDER BY conference_year DESC, video_count DESC
-            """).fetchall()
-            
-            # Overall statistics
-            overall_stats = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_videos,
-                    COUNT(DISTINCT conference_name) as unique_conferences,
-                    COUNT(DISTINCT conference_year) as unique_years,
-                    AVG(view_count) as avg_views,
-                    SUM(duration) as total_duration
-                FROM video_details
-            """).fetchone()
-            
-            conn.close()
+            overall_stats = None
+            conf_stats = []
+            for grouping_id, conf_name, conf_year, count, unique_confs, unique_years, avg_views, total_dur in stats_rows:
+                if grouping_id == 3:
+                    overall_stats = (count, unique_confs, unique_years, avg_views, total_dur)
+                else:
+                    conf_stats.append((conf_name, conf_year, count, avg_views, total_dur))
             
             # Format statistics
-            stats_text = f"📊 Overall Statistics:\n"
-            stats_text += f"   📹 Total Videos: {overall_stats[0]}\n"
-            stats_text += f"   🎯 Unique Conferences: {overall_stats[1]}\n"
-            stats_text += f"   📅 Years Covered: {overall_stats[2]}\n"
-            stats_text += f"   👁️ Average Views: {overall_stats[3]:,.0f}\n"
-            stats_text += f"   ⏱️ Total Duration: {overall_stats[4]/3600:.1f} hours\n\n"
-            
-            stats_text += "📋 Conference Breakdown:\n"
+            stats_lines = [
+                "📊 Overall Statistics:",
+                f"   📹 Total Videos: {overall_stats[0]}",
+                f"   🎯 Unique Conferences: {overall_stats[1]}",
+                f"   📅 Years Covered: {overall_stats[2]}",
+                f"   👁️ Average Views: {overall_stats[3]:,.0f}",
+                f"   ⏱️ Total Duration: {overall_stats[4]/3600:.1f} hours",
+                "",
+                "📋 Conference Breakdown:",
+            ]
             for conf_name, conf_year, count, avg_views, total_dur in conf_stats:
-                stats_text += f"   🎯 {conf_name} {conf_year}: {count} videos, "
-                stats_text += f"{avg_views:,.0f} avg views, {total_dur/3600:.1f}h\n"
+                stats_lines.append(
+                    f"   🎯 {conf_name} {conf_year}: {count} videos, "
+                    f"{avg_views:,.0f} avg views, {total_dur/3600:.1f}h"
+                )
+            stats_text = "\n".join(stats_lines) + "\n"
             
             return [TextContent(
                 type="text",
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 
 import asyncio
+import csv
 import json
-from typing import Any, Dict, List
-from urllib.parse import urlparse, parse_qs
+import re
+import socket
+import tempfile
+import threading
+import urllib.request
+from typing import Any, Dict, Iterator, List, Tuple
 import duckdb
 from pathlib import Path
 
+import requests
 from loguru import logger
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
@@ -17,6 +23,7 @@ from mcp.types import (
     TextContent,
 )
 from pytube import Channel, Playlist
+from pytube import request as pytube_request
 from pytube.exceptions import VideoUnavailable, PytubeError
 
 # Initialize logger
@@ -24,6 +31,73 @@ logger.add("youtube_mcp.log", rotation="10 MB", level="INFO")
 
 # Database setup
 DB_PATH = Path("youtube_videos.db")
+# Every call opens its own connection, so the path string is computed once here
+DB_PATH_STR = str(DB_PATH)
+
+# Tool handlers save from worker threads; concurrent transactions inserting the same
+# new URL would both fail at COMMIT, so saves within this process are serialized
+_DB_LOCK = threading.Lock()
+
+# Maximum number of channels/playlists fetched at once by collect_many_videos
+FETCH_CONCURRENCY = 4
+
+# URL type patterns, matched against the raw URL: "playlist" in the path or query
+# (or a list= parameter) means a playlist; a /channel/, /c/, /@ or /user/ path a channel
+_PLAYLIST_URL_RE = re.compile(r'^[^?#]*/playlist|\?[^#]*(?:playlist|(?<=[?&])list=)')
+_CHANNEL_URL_RE = re.compile(r'^[^?#]*/(?:channel/|c/|@|user/)')
+
+# A collected video: (url, title, channel_name, source_type, source_url),
+# in the column order of the video_urls INSERT
+VideoUrlRow = Tuple[str, str, str, str, str]
+
+# Per-thread HTTP sessions for pytube's page requests, so paginating a channel or
+# playlist reuses keep-alive connections instead of a new TCP+TLS handshake each time.
+# requests.Session is not documented as thread-safe, so each worker thread gets its own
+_http_local = threading.local()
+
+def _get_http_session() -> requests.Session:
+    """Return this thread's requests session, creating it on first use"""
+    session = getattr(_http_local, 'session', None)
+    if session is None:
+        session = _http_local.session = requests.Session()
+        session.headers.update({"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"})
+    return session
+
+def _session_timeout(timeout):
+    """Map pytube's socket default timeout sentinel to requests' 'no timeout'"""
+    return None if timeout is socket._GLOBAL_DEFAULT_TIMEOUT else timeout
+
+def _session_get(url, extra_headers=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Drop-in for pytube.request.get that uses this thread's session"""
+    response = _get_http_session().get(url, headers=extra_headers, timeout=_session_timeout(timeout))
+    response.raise_for_status()
+    return response.content.decode("utf-8")
+
+def _session_post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Drop-in for pytube.request.post that uses this thread's session"""
+    # YouTube is strict about the content type of these JSON requests
+    headers = {**(extra_headers or {}), "Content-Type": "application/json"}
+    if not isinstance(data, bytes):
+        data = json.dumps(data or {}).encode("utf-8")
+    response = _get_http_session().post(url, headers=headers, data=data, timeout=_session_timeout(timeout))
+    response.raise_for_status()
+    return response.content.decode("utf-8")
+
+def install_pytube_session() -> bool:
+    """Route pytube's page requests (pytube.request.get/post) through per-thread sessions
+
+    This replaces the functions process-wide, so it is called explicitly from the
+    entry points rather than on import. It is skipped when a urllib opener has been
+    installed (e.g. by pytube.helpers.install_proxy), since the sessions would bypass
+    that opener's proxy settings. Returns whether the sessions were installed.
+    """
+    if urllib.request._opener is not None:
+        logger.info("urllib opener installed (e.g. pytube proxy); keeping pytube's default requests")
+        return False
+    
+    pytube_request.get = _session_get
+    pytube_request.post = _session_post
+    return True
 
 # 임시 NotificationOptions 클래스 정의
 class NotificationOptions:
@@ -33,7 +107,7 @@ class NotificationOptions:
 
 def init_database():
     """Initialize DuckDB database with video URLs table"""
-    conn = duckdb.connect(str(DB_PATH))
+    conn = duckdb.connect(DB_PATH_STR)
     conn.execute("""
         CREATE SEQUENCE IF NOT EXISTS video_id_seq START 1;
     """)
@@ -51,47 +125,87 @@ def init_database():
     conn.close()
     logger.info("Database initialized")
 
-def save_video_urls(video_data: List[Dict[str, Any]]):
+def save_video_urls(video_data: List[VideoUrlRow]):
     """Save video URLs to DuckDB"""
     if not video_data:
         return
     
-    conn = duckdb.connect(str(DB_PATH))
-    try:
-        for data in video_data:
-            conn.execute("""
-                INSERT OR IGNORE INTO video_urls 
-                (url, title, channel_name, source_type, source_url)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                data['url'],
-                data.get('title', ''),
-                data.get('channel_name', ''),
-                data.get('source_type', ''),
-                data.get('source_url', '')
-            ))
-        logger.info(f"Saved {len(video_data)} video URLs to database")
-    except Exception as e:
-        logger.error(f"Error saving to database: {e}")
-        raise
-    finally:
-        conn.close()
+    # Drop duplicate URLs within the batch up front, keeping the first occurrence,
+    # and insert in url order so the UNIQUE index is built from sorted keys
+    unique_rows = {}
+    for row in video_data:
+        unique_rows.setdefault(row[0], row)
+    video_data = sorted(unique_rows.values(), key=lambda row: row[0])
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Stage the batch as CSV: DuckDB's CSV reader loads it far faster than
+        # binding thousands of Python values as query parameters
+        csv_path = Path(tmp_dir) / "video_urls.csv"
+        with open(csv_path, "w", newline="", encoding="utf-8") as csv_file:
+            csv.writer(csv_file, quoting=csv.QUOTE_ALL, lineterminator="\n").writerows(video_data)
+        
+        # Connect only for this batch so the database file stays unlocked between
+        # calls for the detail server and other processes; saves in this process are
+        # serialized by _DB_LOCK
+        with _DB_LOCK, duckdb.connect(DB_PATH_STR) as conn:
+            # Append-only ingest: every query that cares about order has an ORDER BY
+            conn.execute("SET preserve_insertion_order = false")
+            conn.execute("SET enable_progress_bar = false")
+            try:
+                # Insert the whole batch in a single transaction
+                conn.execute("BEGIN TRANSACTION")
+                # Already stored URLs are filtered out by an anti-join so only new rows
+                # reach the UNIQUE index. ON CONFLICT does not help concurrent transactions
+                # (inserting the same new URL still fails at COMMIT); _DB_LOCK is what keeps
+                # saves apart. Every field is quoted, so empty strings stay '' instead of NULL
+                conn.execute("""
+                    INSERT INTO video_urls 
+                    (url, title, channel_name, source_type, source_url)
+                    SELECT * FROM read_csv(
+                        ?,
+                        auto_detect = false,
+                        header = false,
+                        delim = ',',
+                        quote = '"',
+                        escape = '"',
+                        allow_quoted_nulls = false,
+                        columns = {
+                            'url': 'VARCHAR',
+                            'title': 'VARCHAR',
+                            'channel_name': 'VARCHAR',
+                            'source_type': 'VARCHAR',
+                            'source_url': 'VARCHAR'
+                        }
+                    ) AS batch
+                    WHERE NOT EXISTS (SELECT 1 FROM video_urls v WHERE v.url = batch.url)
+                    ON CONFLICT (url) DO NOTHING
+                """, (str(csv_path),))
+                conn.execute("COMMIT")
+                logger.info(f"Saved {len(video_data)} video URLs to database")
+            except Exception as e:
+                logger.error(f"Error saving to database: {e}")
+                # A failed COMMIT has already aborted the transaction, so there may be
+                # nothing left to roll back
+                try:
+                    conn.execute("ROLLBACK")
+                except duckdb.Error:
+                    pass
+                raise
 
-def get_video_urls_from_channel(channel_url: str) -> List[Dict[str, Any]]:
+def get_video_urls_from_channel(channel_url: str) -> List[VideoUrlRow]:
     """Extract video URLs from a YouTube channel"""
     try:
         logger.info(f"Fetching videos from channel: {channel_url}")
         channel = Channel(channel_url)
         
-        video_data = []
-        for video_url in channel.video_urls:
-            video_data.append({
-                'url': video_url,
-                'title': '',  # Not collecting detailed info as requested
-                'channel_name': channel.channel_name,
-                'source_type': 'channel',
-                'source_url': channel_url
-            })
+        # Read the channel name once instead of through the property for every video
+        channel_name = channel.channel_name
+        
+        # Title is left empty: not collecting detailed info as requested
+        video_data = [
+            (video_url, '', channel_name, 'channel', channel_url)
+            for video_url in channel.video_urls
+        ]
         
         logger.info(f"Found {len(video_data)} videos in channel")
         return video_data
@@ -100,21 +214,19 @@ def get_video_urls_from_channel(channel_url: str) -> List[Dict[str, Any]]:
         logger.error(f"Error fetching channel videos: {e}")
         raise RuntimeError(f"Failed to fetch channel videos: {str(e)}")
 
-def get_video_urls_from_playlist(playlist_url: str) -> List[Dict[str, Any]]:
+def iter_video_urls_from_playlist(playlist_url: str) -> Iterator[VideoUrlRow]:
+    """Yield video URLs from a YouTube playlist as pytube pages through it"""
+    logger.info(f"Fetching videos from playlist: {playlist_url}")
+    playlist = Playlist(playlist_url)
+    
+    for video_url in playlist.video_urls:
+        # Title is left empty: not collecting detailed info as requested
+        yield (video_url, '', '', 'playlist', playlist_url)
+
+def get_video_urls_from_playlist(playlist_url: str) -> List[VideoUrlRow]:
     """Extract video URLs from a YouTube playlist"""
     try:
-        logger.info(f"Fetching videos from playlist: {playlist_url}")
-        playlist = Playlist(playlist_url)
-        
-        video_data = []
-        for video_url in playlist.video_urls:
-            video_data.append({
-                'url': video_url,
-                'title': '',  # Not collecting detailed info as requested
-                'channel_name': '',
-                'source_type': 'playlist',
-                'source_url': playlist_url
-            })
+        video_data = list(iter_video_urls_from_playlist(playlist_url))
         
         logger.info(f"Found {len(video_data)} videos in playlist")
         return video_data
@@ -123,19 +235,60 @@ def get_video_urls_from_playlist(playlist_url: str) -> List[Dict[str, Any]]:
         logger.error(f"Error fetching playlist videos: {e}")
         raise RuntimeError(f"Failed to fetch playlist videos: {str(e)}")
 
+def get_collected_videos_text(limit: int) -> tuple[int, str]:
+    """Get the most recently collected video URLs from DuckDB as (count, formatted text)"""
+    # Runs in a worker thread; the connection is opened and closed for this listing only
+    with duckdb.connect(DB_PATH_STR) as conn:
+        # Rows are formatted and joined by DuckDB, so a single string is fetched
+        return conn.execute("""
+            SELECT
+                COUNT(*),
+                coalesce(string_agg(video_text, '\n' ORDER BY collected_at DESC), '')
+            FROM (
+                SELECT
+                    format(
+                        'URL: {}\nChannel: {}\nSource: {} ({})\nCollected: {}\n---',
+                        url,
+                        coalesce(channel_name, ''),
+                        coalesce(source_type, ''),
+                        coalesce(source_url, ''),
+                        coalesce(CAST(collected_at AS VARCHAR), '')
+                    ) AS video_text,
+                    collected_at
+                FROM video_urls
+                ORDER BY collected_at DESC
+                LIMIT ?
+            )
+        """, (limit,)).fetchone()
+
+async def get_video_urls_from_channel_async(channel_url: str) -> List[VideoUrlRow]:
+    """Extract video URLs from a YouTube channel without blocking the event loop"""
+    return await asyncio.to_thread(get_video_urls_from_channel, channel_url)
+
+async def get_video_urls_from_playlist_async(playlist_url: str) -> List[VideoUrlRow]:
+    """Extract video URLs from a YouTube playlist without blocking the event loop"""
+    return await asyncio.to_thread(get_video_urls_from_playlist, playlist_url)
+
+async def get_video_urls_async(url: str) -> tuple[str, List[VideoUrlRow]]:
+    """Detect whether a URL is a channel or playlist and extract its video URLs"""
+    url_type = identify_youtube_url_type(url)
+    
+    if url_type == "channel":
+        video_data = await get_video_urls_from_channel_async(url)
+    elif url_type == "playlist":
+        video_data = await get_video_urls_from_playlist_async(url)
+    else:
+        raise ValueError("Could not identify URL type. Please use a valid YouTube channel or playlist URL.")
+    
+    return url_type, video_data
+
 def identify_youtube_url_type(url: str) -> str:
     """Identify if URL is a channel or playlist"""
-    parsed = urlparse(url)
-    
-    if 'playlist' in parsed.query or '/playlist' in parsed.path:
+    if _PLAYLIST_URL_RE.search(url):
         return 'playlist'
-    elif '/channel/' in parsed.path or '/c/' in parsed.path or '/@' in parsed.path:
+    elif _CHANNEL_URL_RE.search(url):
         return 'channel'
-    else:
-        # Try to determine from URL structure
-        if '/user/' in parsed.path:
-            return 'channel'
-        return 'unknown'
+    return 'unknown'
 
 # Initialize database on startup
 init_database()
@@ -189,6 +342,21 @@ async def handle_list_tools() -> List[Tool]:
                 "required": ["url"]
             }
         ),
+        Tool(
+            name="collect_many_videos",
+            description="Collect video URLs from several YouTube channels or playlists at once",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "urls": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of YouTube channel or playlist URLs"
+                    }
+                },
+                "required": ["urls"]
+            }
+        ),
         Tool(
             name="get_collected_videos",
             description="Get all collected video URLs from database",
@@ -212,8 +380,8 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     if name == "collect_channel_videos":
         channel_url = arguments["channel_url"]
         try:
-            video_data = get_video_urls_from_channel(channel_url)
-            save_video_urls(video_data)
+            video_data = await get_video_urls_from_channel_async(channel_url)
+            await asyncio.to_thread(save_video_urls, video_data)
             
             return [TextContent(
                 type="text",
@@ -226,8 +394,8 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     elif name == "collect_playlist_videos":
         playlist_url = arguments["playlist_url"]
         try:
-            video_data = get_video_urls_from_playlist(playlist_url)
-            save_video_urls(video_data)
+            video_data = await get_video_urls_from_playlist_async(playlist_url)
+            await asyncio.to_thread(save_video_urls, video_data)
             
             return [TextContent(
                 type="text",
@@ -240,16 +408,8 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     elif name == "auto_collect_videos":
         url = arguments["url"]
         try:
-            url_type = identify_youtube_url_type(url)
-            
-            if url_type == "channel":
-                video_data = get_video_urls_from_channel(url)
-            elif url_type == "playlist":
-                video_data = get_video_urls_from_playlist(url)
-            else:
-                raise ValueError("Could not identify URL type. Please use a valid YouTube channel or playlist URL.")
-            
-            save_video_urls(video_data)
+            url_type, video_data = await get_video_urls_async(url)
+            await asyncio.to_thread(save_video_urls, video_data)
             
             return [TextContent(
                 type="text",
@@ -259,26 +419,49 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
             logger.error(f"Error in auto_collect_videos: {e}")
             raise RuntimeError(str(e))
     
+    elif name == "collect_many_videos":
+        urls = arguments["urls"]
+        try:
+            # Fetch all channels/playlists concurrently (bounded to avoid YouTube rate limiting)
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+            
+            async def fetch_one(url):
+                async with semaphore:
+                    return await get_video_urls_async(url)
+            
+            fetched = await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+            
+            all_video_data = []
+            results = []
+            for url, result in zip(urls, fetched):
+                if isinstance(result, Exception):
+                    results.append(f"❌ {url}: {result}")
+                    logger.error(f"Error collecting {url}: {result}")
+                else:
+                    url_type, video_data = result
+                    all_video_data.extend(video_data)
+                    results.append(f"✅ {url}: {len(video_data)} video URLs from {url_type}")
+            
+            # Save the videos from every URL in a single bulk insert
+            await asyncio.to_thread(save_video_urls, all_video_data)
+            
+            return [TextContent(
+                type="text",
+                text=f"Collected {len(all_video_data)} video URLs from {len(urls)} URLs and saved to database:\n\n"
+                     + "\n".join(results)
+            )]
+        except Exception as e:
+            logger.error(f"Error in collect_many_videos: {e}")
+            raise RuntimeError(str(e))
+    
     elif name == "get_collected_videos":
         limit = arguments.get("limit", 100)
         try:
-            conn = duckdb.connect(str(DB_PATH))
-            result = conn.execute("""
-                SELECT url, title, channel_name, source_type, source_url, collected_at
-                FROM video_urls
-                ORDER BY collected_at DESC
-                LIMIT ?
-            """, (limit,)).fetchall()
-            conn.close()
-            
-            videos_text = "\n".join([
-                f"URL: {row[0]}\nChannel: {row[2]}\nSource: {row[3]} ({row[4]})\nCollected: {row[5]}\n---"
-                for row in result
-            ])
+            video_count, videos_text = await asyncio.to_thread(get_collected_videos_text, limit)
             
             return [TextContent(
                 type="text",
-                text=f"Found {len(result)} collected video URLs:\n\n{videos_text}"
+                text=f"Found {video_count} collected video URLs:\n\n{videos_text}"
             )]
         except Exception as e:
             logger.error(f"Error in get_collected_videos: {e}")
@@ -290,6 +473,7 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
 async def main():
     """Main entry point"""
     logger.info("Starting YouTube MCP Server")
+    install_pytube_session()
     
     # Use stdio transport
     async with stdio_server() as (read_stream, write_stream):
@@ -312,6 +496,7 @@ if __name__ == "__main__":
         # 명령줄에서 직접 수집 실행
         url = sys.argv[2]
         init_database()
+        install_pytube_session()
         
         try:
             url_type = identify_youtube_url_type(url)